@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+
+# Unified runner for the day solvers:
+#
+#   python -m aoc run [DAY ...] [--suffix _test] [--cache DIR]
+#   python -m aoc bench [DAY ...] [--suffix _test] [--cache DIR] [--warmup N] [--repeat N] [--json] [--save]
+#   python -m aoc compare [DAY ...] [--suffix _test] [--baseline COMMIT] [--alpha P] [--floor S] [--save]
+#   python -m aoc scale DAY --sizes N [N ...] [--seed N] [--repeat N] [--json]
+
+import argparse
+import glob
+import hashlib
+import importlib
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict, field
+from functools import cache
+from types import ModuleType
+
+import regex as re
+
+from generate import generate
+from utils import cached_parse, get_input_filename, PARSE_CACHE_ENV
+
+PHASES = ("parse", "part1", "part2")
+HISTORY_FILE = "bench_history.jsonl"
+# Sample sizes up to which compare uses the exact U distribution
+EXACT_U_LIMIT = 30
+
+
+@dataclass
+class PhaseStats:
+    day: int
+    phase: str
+    min: float
+    median: float
+    p95: float
+    peak_kib: float
+    times: list[float] = field(default_factory=list)
+    answer: str | None = None
+    commit: str = ""
+    input_hash: str = ""
+    dirty: bool = False
+
+
+def discover_days() -> list[int]:
+    days = []
+    for path in glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "day*.py")):
+        m = re.fullmatch(r"day(\d+)\.py", os.path.basename(path))
+        if m:
+            days.append(int(m.group(1)))
+    return sorted(days)
+
+
+def load_day(day: int) -> ModuleType:
+    return importlib.import_module(f"day{day}")
+
+
+def read_input(day: int, suffix: str = "") -> str:
+    with open(get_input_filename(day, suffix), encoding="utf-8") as infile:
+        return infile.read()
+
+
+def run_phase(module: ModuleType, phase: str, s: str):
+    # Every phase starts from a fresh parse, so parts never see state left by another part
+    if phase == "parse":
+        return cached_parse(module.parse_input, s)
+    return getattr(module, phase)(cached_parse(module.parse_input, s))
+
+
+def time_phase(module: ModuleType, phase: str, s: str) -> tuple[float, object]:
+    if phase == "parse":
+        start = time.perf_counter()
+        result = cached_parse(module.parse_input, s)
+        return time.perf_counter() - start, result
+    parsed = cached_parse(module.parse_input, s)
+    start = time.perf_counter()
+    result = getattr(module, phase)(parsed)
+    return time.perf_counter() - start, result
+
+
+def peak_memory(module: ModuleType, phase: str, s: str) -> int:
+    # Measured in a separate run since tracemalloc slows down the timed ones
+    parsed = None if phase == "parse" else cached_parse(module.parse_input, s)
+    tracemalloc.start()
+    try:
+        if parsed is None:
+            cached_parse(module.parse_input, s)
+        else:
+            getattr(module, phase)(parsed)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def bench_phase(day: int, module: ModuleType, phase: str, s: str, warmup: int, repeat: int) -> PhaseStats:
+    for _ in range(warmup):
+        time_phase(module, phase, s)
+    times, result = [], None
+    for _ in range(repeat):
+        elapsed, result = time_phase(module, phase, s)
+        times.append(elapsed)
+    return PhaseStats(
+        day=day,
+        phase=phase,
+        min=min(times),
+        median=statistics.median(times),
+        p95=percentile(times, 0.95),
+        peak_kib=peak_memory(module, phase, s) / 1024,
+        times=times,
+        answer=None if phase == "parse" else str(result),
+        input_hash=hashlib.sha256(s.encode()).hexdigest(),
+    )
+
+
+def current_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def worktree_dirty() -> bool:
+    # Uncommitted changes to tracked files; the history file and other untracked files don't count
+    try:
+        out = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                             text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return bool(out.stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+
+def save_history(stats: list[PhaseStats], path: str = HISTORY_FILE):
+    with open(path, "a", encoding="utf-8") as outfile:
+        for st in stats:
+            outfile.write(json.dumps(asdict(st)) + "\n")
+
+
+def load_history(path: str = HISTORY_FILE) -> list[PhaseStats]:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as infile:
+        return [PhaseStats(**json.loads(line)) for line in infile if line.strip()]
+
+
+@cache
+def u_counts(n1: int, n2: int) -> tuple[int, ...]:
+    # u_counts(n1, n2)[u] is the number of orderings of n1 + n2 untied values in which
+    # u of the (second, first) pairs have the second value larger
+    if not n1 or not n2:
+        return (1,)
+    # The largest value is either from the second sample, beating all n1 of the first, or not
+    with_second, without = u_counts(n1, n2 - 1), u_counts(n1 - 1, n2)
+    counts = [0] * (n1 * n2 + 1)
+    for u, c in enumerate(with_second):
+        counts[u + n1] += c
+    for u, c in enumerate(without):
+        counts[u] += c
+    return tuple(counts)
+
+
+def mann_whitney_p(baseline: list[float], current: list[float]) -> float:
+    # One-sided p-value for "current tends to be slower than baseline": exact for
+    # small samples (ties rounded towards the null), otherwise the normal
+    # approximation with continuity correction
+    n1, n2 = len(baseline), len(current)
+    u = sum(1.0 if c > b else 0.5 if c == b else 0.0 for c in current for b in baseline)
+    if n1 <= EXACT_U_LIMIT and n2 <= EXACT_U_LIMIT:
+        counts = u_counts(n1, n2)
+        return sum(counts[math.floor(u):]) / math.comb(n1 + n2, n1)
+    mean = n1 * n2 / 2
+    sd = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    if sd == 0:
+        return 1.0
+    z = (u - mean - 0.5) / sd
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def holm(p_values: list[float]) -> list[float]:
+    # Holm-Bonferroni adjusted p-values, so the whole family of tests keeps the significance level
+    order = sorted(range(len(p_values)), key=p_values.__getitem__)
+    adjusted, running = [1.0] * len(p_values), 0.0
+    for rank, i in enumerate(order):
+        running = max(running, min(1.0, (len(p_values) - rank) * p_values[i]))
+        adjusted[i] = running
+    return adjusted
+
+
+def find_baseline(history: list[PhaseStats], current: PhaseStats, commit: str | None) -> PhaseStats | None:
+    # Most recent clean saved result for the same day, phase and input, optionally at a given
+    # commit; by default from another commit, or from the same one when the tree is dirty
+    for old in reversed(history):
+        if (old.day, old.phase, old.input_hash) != (current.day, current.phase, current.input_hash):
+            continue
+        if old.dirty:
+            continue
+        if commit is None and old.commit == current.commit and not current.dirty:
+            continue
+        if commit is None or old.commit.startswith(commit):
+            return old
+    return None
+
+
+def format_table(stats: list[PhaseStats]) -> str:
+    lines = [f"{'day':>4} {'phase':<6} {'min (s)':>10} {'median (s)':>10} {'p95 (s)':>10} {'peak (KiB)':>11}"]
+    for st in stats:
+        lines.append(f"{st.day:>4} {st.phase:<6} {st.min:>10.6f} {st.median:>10.6f} {st.p95:>10.6f} {st.peak_kib:>11.1f}")
+    return "\n".join(lines)
+
+
+def cmd_run(args: argparse.Namespace):
+    for day in args.days or discover_days():
+        module = load_day(day)
+        s = read_input(day, args.suffix)
+        for phase in PHASES[1:]:
+            print(f"day{day} {phase}: {run_phase(module, phase, s)}")
+
+
+def bench_days(args: argparse.Namespace) -> list[PhaseStats]:
+    commit, dirty = current_commit(), worktree_dirty()
+    stats = []
+    for day in args.days or discover_days():
+        module = load_day(day)
+        s = read_input(day, args.suffix)
+        for phase in PHASES:
+            st = bench_phase(day, module, phase, s, args.warmup, args.repeat)
+            st.commit = commit
+            st.dirty = dirty
+            stats.append(st)
+    if args.save:
+        save_history(stats)
+    return stats
+
+
+def cmd_bench(args: argparse.Namespace):
+    stats = bench_days(args)
+    if args.json:
+        print(json.dumps([asdict(st) for st in stats], indent=2))
+    else:
+        print(format_table(stats))
+
+
+def cmd_compare(args: argparse.Namespace):
+    history = load_history()
+    stats = bench_days(args)
+    bases = [find_baseline(history, st, args.baseline) for st in stats]
+    # Phases faster than the floor on both sides are too noisy to time, only their answers are checked
+    tested = [i for i, (st, base) in enumerate(zip(stats, bases))
+              if base is not None and max(st.median, base.median) >= args.floor]
+    p_values = dict(zip(tested, holm([mann_whitney_p(bases[i].times, stats[i].times) for i in tested])))
+    failed = False
+    print(f"{'day':>4} {'phase':<6} {'base (s)':>10} {'now (s)':>10} {'ratio':>6} {'p':>7}  status")
+    for i, (st, base) in enumerate(zip(stats, bases)):
+        if base is None:
+            print(f"{st.day:>4} {st.phase:<6} {'-':>10} {st.median:>10.6f} {'-':>6} {'-':>7}  no baseline")
+            continue
+        p = p_values.get(i)
+        ratio = st.median / base.median if base.median else math.inf
+        status = "ok" if p is not None else "ok (below floor)"
+        if base.answer != st.answer:
+            status = f"ANSWER CHANGED ({base.answer} -> {st.answer})"
+        elif p is not None and p < args.alpha and ratio > 1 + args.tolerance:
+            status = "SLOWER"
+        failed = failed or not status.startswith("ok")
+        shown = f"{p:>7.4f}" if p is not None else f"{'-':>7}"
+        print(f"{st.day:>4} {st.phase:<6} {base.median:>10.6f} {st.median:>10.6f} {ratio:>6.2f} {shown}  {status}")
+    if failed:
+        sys.exit(1)
+
+
+def cmd_scale(args: argparse.Namespace):
+    # Time and memory of each phase against synthetic inputs of growing size
+    module = load_day(args.day)
+    rows = []
+    for size in args.sizes:
+        s = generate(args.day, size, args.seed)
+        for phase in PHASES:
+            st = bench_phase(args.day, module, phase, s, args.warmup, args.repeat)
+            rows.append({"size": size, "bytes": len(s), "phase": phase, "median": st.median, "peak_kib": st.peak_kib})
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'size':>8} {'bytes':>10} {'phase':<6} {'median (s)':>10} {'peak (KiB)':>11}")
+    for row in rows:
+        print(f"{row['size']:>8} {row['bytes']:>10} {row['phase']:<6} {row['median']:>10.6f} {row['peak_kib']:>11.1f}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="aoc")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="print the answers")
+    bench = commands.add_parser("bench", help="time each phase")
+    compare = commands.add_parser("compare", help="check for slowdowns and changed answers against saved results")
+    for p in (run, bench, compare):
+        p.add_argument("days", nargs="*", type=int, help="days to include, all by default")
+        p.add_argument("--suffix", default="", help="input file suffix, e.g. _test")
+    for p in (run, bench):
+        p.add_argument("--cache", metavar="DIR", help="reuse parse results cached on disk in DIR")
+    for p in (bench, compare):
+        p.add_argument("--warmup", type=int, default=1)
+        # compare needs more runs, or no slowdown could stay significant after the correction
+        p.add_argument("--repeat", type=int, default=10 if p is compare else 5)
+        p.add_argument("--save", action="store_true", help=f"append the results to {HISTORY_FILE}")
+    bench.add_argument("--json", action="store_true", help="emit JSON instead of a table")
+    compare.add_argument("--baseline", help="commit to compare against; by default the latest other commit, "
+                         "or the current one if the tree has uncommitted changes")
+    compare.add_argument("--alpha", type=float, default=0.05,
+                         help="significance level of the slowdown tests, Holm-corrected across phases")
+    compare.add_argument("--floor", type=float, default=0.001,
+                         help="phases with medians under this many seconds are not timed against the baseline")
+    compare.add_argument("--tolerance", type=float, default=0.1, help="relative slowdown ignored as noise")
+    run.set_defaults(func=cmd_run)
+    bench.set_defaults(func=cmd_bench)
+    compare.set_defaults(func=cmd_compare)
+    scale = commands.add_parser("scale", help="time each phase on generated inputs of growing size")
+    scale.add_argument("day", type=int)
+    scale.add_argument("--sizes", nargs="+", type=int, required=True)
+    scale.add_argument("--seed", type=int, default=0)
+    scale.add_argument("--warmup", type=int, default=0)
+    scale.add_argument("--repeat", type=int, default=3)
+    scale.add_argument("--json", action="store_true", help="emit JSON instead of a table")
+    scale.set_defaults(func=cmd_scale)
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    if getattr(args, "cache", None):
+        os.environ[PARSE_CACHE_ENV] = args.cache
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
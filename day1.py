@@ -1,13 +1,8 @@
 #!/usr/bin/env python3
 
 import regex as re
-from utils import get_day_input
-
-
-def calibration_value(line: str) -> int:
-    digits = re.findall(r"\d", line)
-    first, last = int(digits[0]), int(digits[-1])
-    return first * 10 + last
+from typing import Iterable
+from utils import iter_day_input_lines, split_lines
 
 
 TR_MAP = {
@@ -23,31 +18,58 @@ TR_MAP = {
 }
 
 
-def to_int(s: str) -> int:
-    n = TR_MAP.get(s)
-    if n is not None:
-        return n
-    return int(s)
+DIGIT_MAP = {str(n): n for n in range(10)}
+
+
+class DigitScanner:
+    # Finds the first match with a forward search and the last with a reverse one,
+    # so a line costs two short scans regardless of how many digits it holds
+    def __init__(self, vocabulary: dict[str, int]) -> None:
+        pattern = "|".join(re.escape(w) for w in sorted(vocabulary, key=len, reverse=True))
+        self.values = vocabulary | {w.encode(): n for w, n in vocabulary.items()}
+        self.forward = re.compile(pattern)
+        self.backward = re.compile(pattern, flags=re.REVERSE)
+        self.forward_bytes = re.compile(pattern.encode())
+        self.backward_bytes = re.compile(pattern.encode(), flags=re.REVERSE)
+
+    def first_last(self, line: str | bytes) -> tuple[int, int]:
+        if isinstance(line, str):
+            first, last = self.forward.search(line), self.backward.search(line)
+        else:
+            first, last = self.forward_bytes.search(line), self.backward_bytes.search(line)
+        return self.values[first.group()], self.values[last.group()]
+
 
+DIGITS = DigitScanner(DIGIT_MAP)
+WORDS_AND_DIGITS = DigitScanner(TR_MAP | DIGIT_MAP)
 
-def calibration_value2(line: str) -> int:
-    digits = re.findall(r"one|two|three|four|five|six|seven|eight|nine|\d", line, overlapped=True)
-    first, last = to_int(digits[0]), to_int(digits[-1])
+
+def calibration_value(line: str | bytes) -> int:
+    first, last = DIGITS.first_last(line)
+    return first * 10 + last
+
+
+def calibration_value2(line: str | bytes) -> int:
+    first, last = WORDS_AND_DIGITS.first_last(line)
     return first * 10 + last
 
 
-def part1(lines: list[str]) -> int:
+def parse_input(s: str) -> list[str]:
+    return split_lines(s)
+
+
+def part1(lines: Iterable[str | bytes]) -> int:
     return sum(calibration_value(line) for line in lines)
 
 
-def part2(lines: list[str]) -> int:
+def part2(lines: Iterable[str | bytes]) -> int:
     return sum(calibration_value2(line) for line in lines)
 
 
 def main():
-    lines = get_day_input(1)
-    print(part1(lines))
-    print(part2(lines))
+    # Lines are independent, so both parts stream them straight from the mapped file
+    print(part1(iter_day_input_lines(1)))
+    print(part2(iter_day_input_lines(1)))
 
 
 if __name__ == "__main__":
@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from itertools import product
 from typing import ClassVar
 
-from utils import get_day_input_full_content
+from utils import cached_parse, get_day_input_full_content, Grid
 
 Tile = namedtuple("Tile", ["shape", "row", "col"])
 
@@ -70,17 +70,110 @@ class PipeMap:
 
     def _find_loop(self):
         loop: list[Tile] = [self.start]
+        seen: set[Tile] = {self.start}
         while True:
             curr = loop[-1]
             for n in self.find_fitting_neighbours(curr):
                 # need at least three tiles to form a loop
                 if len(loop) >= 3 and n == self.start:
-                    return set(loop)
-                if n not in loop:
+                    return seen
+                if n not in seen:
                     # assume there can be only one path
                     loop.append(n)
+                    seen.add(n)
                     break
 
+    def loop_size(self) -> int:
+        return len(self.loop)
+
+    def count_enclosed(self) -> int:
+        count = 0
+        for row in self.grid:
+            inside = False
+            for tile in row:
+                if tile in self.loop:
+                    if tile.shape in ("|", "F", "7"):
+                        inside = not inside
+                elif inside:
+                    count += 1
+        return count
+
+
+class CompactPipeMap:
+    # Shapes live in the flat buffer of a Grid indexed by row * width + col,
+    # loop membership in a bitmap over the same indices
+    OPPOSITE: ClassVar[dict[str, str]] = {"N": "S", "S": "N", "E": "W", "W": "E"}
+    DIRECTIONS: ClassVar[dict[str, tuple[int, int]]] = {"N": (-1, 0), "S": (1, 0), "E": (0, 1), "W": (0, -1)}
+    # bytes.translate table marking the shapes that flip inside/outside with "1", the rest with "0"
+    CROSSINGS: ClassVar[bytes] = bytes(ord("1") if chr(b) in "|F7" else ord("0") for b in range(256))
+
+    def __init__(self, grid: Grid) -> None:
+        self.grid = grid
+        self.cells = grid.cells
+        self.width = grid.width
+        self.height = grid.height
+        self.deltas = {d: grid.offsets[v] for d, v in self.DIRECTIONS.items()}
+        self.start = self.cells.index(b"S")
+        self.cells[self.start] = ord(self.find_fitting_shape(self.start))
+        self.loop = bytearray((len(self.cells) + 7) // 8)
+        self._loop_size = self._trace_loop()
+
+    def step(self, pos: int, direction: str) -> int | None:
+        # Flat offset, with the edge checks inlined as this is the hot loop
+        n = pos + self.deltas[direction]
+        if direction == "N":
+            return n if n >= 0 else None
+        if direction == "S":
+            return n if n < len(self.cells) else None
+        if direction == "E":
+            return n if n % self.width else None
+        return n if pos % self.width else None
+
+    def fits(self, pos: int, direction: str) -> bool:
+        n = self.step(pos, direction)
+        return n is not None and chr(self.cells[n]) in PipeMap.FITTINGS[direction]
+
+    def find_fitting_shape(self, pos: int) -> str:
+        for shape, orientations in PipeMap.SHAPES.items():
+            if self.fits(pos, orientations[0]) and self.fits(pos, orientations[1]):
+                return shape
+
+    def in_loop(self, pos: int) -> bool:
+        return bool(self.loop[pos >> 3] & (1 << (pos & 7)))
+
+    def _trace_loop(self) -> int:
+        pos, direction, size = self.start, PipeMap.SHAPES[chr(self.cells[self.start])][0], 0
+        while True:
+            self.loop[pos >> 3] |= 1 << (pos & 7)
+            size += 1
+            pos = self.step(pos, direction)
+            if pos == self.start:
+                return size
+            came_from = self.OPPOSITE[direction]
+            fst, snd = PipeMap.SHAPES[chr(self.cells[pos])]
+            direction = snd if fst == came_from else fst
+
+    def loop_size(self) -> int:
+        return self._loop_size
+
+    def count_enclosed(self) -> int:
+        # Each row is handled as integers with bit c standing for column c: the loop cells,
+        # the crossings among them, and their running parity, which is set on the cells
+        # from an odd crossing on and so marks the inside once loop cells are masked out
+        width, count = self.width, 0
+        row_mask = (1 << width) - 1
+        for row_start in range(0, len(self.cells), width):
+            row_end = row_start + width
+            loop = int.from_bytes(self.loop[row_start >> 3:(row_end + 7) >> 3], "little") >> (row_start & 7)
+            loop &= row_mask
+            inside = int(self.cells[row_start:row_end].translate(self.CROSSINGS)[::-1], 2) & loop
+            shift = 1
+            while shift < width:
+                inside ^= inside << shift
+                shift <<= 1
+            count += (inside & row_mask & ~loop).bit_count()
+        return count
+
 
 def parse_pipe_map(s: str) -> PipeMap:
     grid: list[list[Tile]] = []
@@ -95,6 +188,10 @@ def parse_pipe_map(s: str) -> PipeMap:
             return PipeMap(grid=grid, start=grid[i][j])
 
 
+def parse_compact_pipe_map(s: str) -> CompactPipeMap:
+    return CompactPipeMap(grid=Grid.parse(s))
+
+
 def debug_print(pm: PipeMap):
     screen = []
     for row in pm.grid:
@@ -111,26 +208,21 @@ def debug_print(pm: PipeMap):
     print("\n".join(screen))
 
 
-def part1(pm: PipeMap) -> int:
-    return len(pm.loop) // 2
+def parse_input(s: str) -> CompactPipeMap:
+    return parse_compact_pipe_map(s)
 
 
-def part2(pm: PipeMap) -> int:
-    count = 0
-    for row in pm.grid:
-        inside = False
-        for tile in row:
-            if tile in pm.loop:
-                if tile.shape in ("|", "F", "7"):
-                    inside = not inside
-            elif inside:
-                count += 1
-    return count
+def part1(pm: PipeMap | CompactPipeMap) -> int:
+    return pm.loop_size() // 2
+
+
+def part2(pm: PipeMap | CompactPipeMap) -> int:
+    return pm.count_enclosed()
 
 
 def main():
     s = get_day_input_full_content(10)
-    pm = parse_pipe_map(s)
+    pm = cached_parse(parse_input, s)
     print(part1(pm))
     print(part2(pm))
 
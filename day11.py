@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
-from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from itertools import accumulate
 from multiprocessing import Pool
 from typing import Iterable
 
 from astar import AStar
 
-from utils import get_day_input_full_content
+from utils import cached_parse, get_day_input_full_content, Grid
 
 
 @dataclass(order=True)
@@ -26,8 +26,13 @@ class Image:
     height: int
     width: int
     galaxies: list[Pixel]
-    space: set[Pixel]
+    empty_rows: set[int]
+    empty_cols: set[int]
     expansion: int = 0
+    coefficients: tuple[int, int] | None = field(default=None, init=False, repr=False)
+
+    def is_space(self, pixel: Pixel) -> bool:
+        return pixel.row in self.empty_rows or pixel.col in self.empty_cols
 
     def neighbours(self, pixel: Pixel) -> list[Pixel]:
         ret = []
@@ -43,7 +48,7 @@ class Image:
 
     def min_distance(self, start: Pixel, end: Pixel) -> int:
         path = ImageAStar(self).astar(start=start, goal=end, reversePath=True)
-        return sum(self.expansion if n in self.space else 1 for n in path) - 1
+        return sum(self.expansion if self.is_space(n) else 1 for n in path) - 1
 
     def min_distances(self, index: int) -> tuple[int, dict[int, int]]:
         galaxy = self.galaxies[index]
@@ -73,37 +78,51 @@ class ImageAStar(AStar):
 
 
 def parse_image(s: str) -> Image:
-    galaxies = []
-    empty = {"rows": defaultdict(int), "cols": defaultdict(int)}
-    lines = [line for line in s.split("\n") if line]
-    for row, line in enumerate(lines):
-        for col, ch in enumerate(line):
-            if ch == "#":
-                g = Pixel(row=row, col=col)
-                galaxies.append(g)
-            else:
-                empty["rows"][row] += 1
-                empty["cols"][col] += 1
-    width = len(lines[0])
-    space = set()
-    for row, cnt in empty["rows"].items():
-        if cnt == width:
-            for col in range(width):
-                space.add(Pixel(row=row, col=col))
-    height = len(lines)
-    for col, cnt in empty["cols"].items():
-        if cnt == len(lines):
-            for row in range(height):
-                space.add(Pixel(row=row, col=col))
+    grid = Grid.parse(s)
     return Image(
-        height=height,
-        width=width,
-        galaxies=galaxies,
-        space=space,
+        height=grid.height,
+        width=grid.width,
+        galaxies=[Pixel(row=row, col=col) for row, col in grid.find_all("#")],
+        empty_rows={row for row, mask in enumerate(grid.row_masks("#")) if not mask},
+        empty_cols={col for col, mask in enumerate(grid.col_masks("#")) if not mask},
     )
 
 
+def pairwise_sum(values: list[int]) -> int:
+    # Sum of |a - b| over all pairs of a sorted list
+    total, prefix = 0, 0
+    for i, v in enumerate(values):
+        total += v * i - prefix
+        prefix += v
+    return total
+
+
+def axis_coefficients(coords: list[int], empty: set[int], size: int) -> tuple[int, int]:
+    # Pairwise distance along one axis is base + (expansion - 1) * empty_crossings
+    empty_before = list(accumulate((1 if i in empty else 0 for i in range(size)), initial=0))
+    coords = sorted(coords)
+    return pairwise_sum(coords), pairwise_sum([empty_before[c] for c in coords])
+
+
+def distance_coefficients(image: Image) -> tuple[int, int]:
+    if image.coefficients is None:
+        row_base, row_crossings = axis_coefficients([g.row for g in image.galaxies], image.empty_rows, image.height)
+        col_base, col_crossings = axis_coefficients([g.col for g in image.galaxies], image.empty_cols, image.width)
+        image.coefficients = row_base + col_base, row_crossings + col_crossings
+    return image.coefficients
+
+
+def evaluate_distance(coefficients: tuple[int, int], expansion: int) -> int:
+    base, empty_crossings = coefficients
+    return base + (expansion - 1) * empty_crossings
+
+
 def compute_total_distance(image: Image, expansion: int = None) -> int:
+    return evaluate_distance(distance_coefficients(image), expansion or image.expansion)
+
+
+def compute_total_distance_astar(image: Image, expansion: int = None) -> int:
+    # Pairwise A* search, usable as a checker for images with arbitrary obstacles
     if expansion:
         image.expansion = expansion
     with Pool() as pool:
@@ -115,6 +134,10 @@ def compute_total_distance(image: Image, expansion: int = None) -> int:
     return total
 
 
+def parse_input(s: str) -> Image:
+    return parse_image(s)
+
+
 def part1(image: Image) -> int:
     return compute_total_distance(image, expansion=2)
 
@@ -125,7 +148,7 @@ def part2(image: Image) -> int:
 
 def main():
     s = get_day_input_full_content(11)
-    image = parse_image(s)
+    image = cached_parse(parse_input, s)
     print(part1(image))
     print(part2(image))
 
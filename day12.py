@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 from dataclasses import dataclass
-from functools import cache
+from itertools import accumulate
 
-from utils import get_day_input_full_content, parse_ints
+from utils import cached_parse, get_day_input_full_content, parse_ints
 
 
 @dataclass
@@ -27,22 +27,48 @@ def parse_records(s: str) -> list[Record]:
     return records
 
 
-@cache
-def arrangements(conditions, rules):
-    if not rules:
-        return 0 if "#" in conditions else 1
-    if not conditions:
-        return 1 if not rules else 0
-
-    result = 0
-
-    if conditions[0] in ".?":
-        result += arrangements(conditions[1:], rules)
-    if conditions[0] in "#?":
-        if rules[0] <= len(conditions) and "." not in conditions[: rules[0]] and (
-                rules[0] == len(conditions) or conditions[rules[0]] != "#"):
-            result += arrangements(conditions[rules[0] + 1:], rules[1:])
-    return result
+def arrangements(conditions: str, rules: tuple[int, ...]) -> int:
+    # Tabulated DP over positions: ways[i] counts placements of rules[j:] into conditions[i:],
+    # computed for j from last rule to first with one row kept at a time. A trailing "."
+    # lets every block be followed by a separator.
+    conditions += "."
+    n = len(conditions)
+    damaged = [c == "#" for c in conditions]
+    # open_run[i]: cells from i on before the next ".", so a block of length r fits at i
+    # when open_run[i] >= r and the cell after it is not damaged
+    open_run = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        open_run[i] = 0 if conditions[i] == "." else open_run[i + 1] + 1
+    ways = [0] * (n + 1)
+    ways[n] = 1
+    for i in range(n - 1, -1, -1):
+        ways[i] = 0 if damaged[i] else ways[i + 1]
+    # Row j is only needed from just after the leftmost placement of rules[:j], and is
+    # zero past the rightmost start of rule j that leaves room for rules[j + 1:]
+    lo, pos = [], 0
+    for rule in rules:
+        lo.append(pos)
+        pos = next((i for i in range(pos, n - rule) if open_run[i] >= rule and not damaged[i + rule]), n)
+        pos += rule + 1
+    hi, pos = [0] * len(rules), n
+    for j in range(len(rules) - 1, -1, -1):
+        rule = rules[j]
+        pos = next((i for i in range(min(pos, n) - rule - 1, -1, -1)
+                    if open_run[i] >= rule and not damaged[i + rule]), -1)
+        hi[j] = pos
+    for j in range(len(rules) - 1, -1, -1):
+        rule = rules[j]
+        prev, ways = ways, [0] * (n + 1)
+        for i in range(hi[j], lo[j] - 1, -1):
+            count = 0 if damaged[i] else ways[i + 1]
+            if open_run[i] >= rule and not damaged[i + rule]:
+                count += prev[i + rule + 1]
+            ways[i] = count
+    return ways[0]
+
+
+def parse_input(s: str) -> list[Record]:
+    return parse_records(s)
 
 
 def part1(records: list[Record]):
@@ -56,7 +82,7 @@ def part2(records: list[Record]):
 
 def main():
     s = get_day_input_full_content(12)
-    records = parse_records(s)
+    records = cached_parse(parse_input, s)
     print(part1(records))
     print(part2(records))
 
@@ -1,39 +1,36 @@
 #!/usr/bin/env python3
 from collections import namedtuple
-from utils import get_day_input_full_content
+from utils import cached_parse, get_day_input_full_content, Grid
 
 Pattern = namedtuple("Pattern", ["rows", "cols"])
 
 
 def parse_patterns(s: str) -> list[Pattern]:
+    # Rows and columns are encoded as integers, one bit per cell ("#" is 1)
     patterns = []
     for block in s.split("\n\n"):
-        rows = [r for r in block.split("\n") if r]
-        cols = []
-        for i in range(len(rows[0])):
-            col = ""
-            for j in range(len(rows)):
-                col += rows[j][i]
-            cols.append(col)
-        patterns.append(Pattern(rows=rows, cols=cols))
+        grid = Grid.parse(block)
+        patterns.append(Pattern(rows=grid.row_masks("#"), cols=grid.col_masks("#")))
     return patterns
 
 
-def find_reflection(pattern: Pattern) -> tuple[str, int]:
-    for i in range(len(pattern.cols) - 1):
-        j, k = i, i + 1
-        while j >= 0 and k < len(pattern.cols) and pattern.cols[j] == pattern.cols[k]:
-            j -= 1
-            k += 1
-        if j < 0 or k >= len(pattern.cols):
-            return "v", i + 1
-    for i in range(len(pattern.rows) - 1):
-        j, k = i, i + 1
-        while j >= 0 and k < len(pattern.rows) and pattern.rows[j] == pattern.rows[k]:
-            j -= 1
-            k += 1
-        if j < 0 or k >= len(pattern.rows):
-            return "h", i + 1
+def count_mismatches(lines: list[int], i: int, limit: int) -> int:
+    # Cells differing across the mirror between lines i and i + 1, stopping once over limit
+    mismatches = 0
+    j, k = i, i + 1
+    while j >= 0 and k < len(lines) and mismatches <= limit:
+        mismatches += (lines[j] ^ lines[k]).bit_count()
+        j -= 1
+        k += 1
+    return mismatches
+
+
+def find_reflection(pattern: Pattern, mismatches: int = 0) -> tuple[str, int]:
+    # The mirror whose reflected cells differ in exactly `mismatches` places
+    for orientation, lines in (("v", pattern.cols), ("h", pattern.rows)):
+        for i in range(len(lines) - 1):
+            if count_mismatches(lines, i, mismatches) == mismatches:
+                return orientation, i + 1
     return "", -1
 
 
@@ -43,17 +40,21 @@ scoring = {
 }
 
 
+def parse_input(s: str) -> list[Pattern]:
+    return parse_patterns(s)
+
+
 def part1(patterns: list[Pattern]) -> int:
     return sum(scoring[o](n) for o, n in (find_reflection(p) for p in patterns))
 
 
 def part2(patterns: list[Pattern]) -> int:
-    pass
+    return sum(scoring[o](n) for o, n in (find_reflection(p, mismatches=1) for p in patterns))
 
 
 def main():
     s = get_day_input_full_content(13)
-    patterns = parse_patterns(s)
+    patterns = cached_parse(parse_input, s)
     print(part1(patterns))
     print(part2(patterns))
 
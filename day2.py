@@ -2,70 +2,74 @@
 
 
 import regex as re
-from collections import defaultdict
-from utils import get_day_input
+from array import array
+from typing import Iterable
 
+import numpy as np
 
-class Game:
-    def __init__(self, gid: int) -> None:
-        self.id: int = gid
-        self.rounds: list[dict[str, int]] = []
+from utils import cached_parse, get_day_input_full_content, split_lines
 
 
-def parse_game_round(s: str) -> dict[str, int]:
-    game_round = defaultdict(int)
-    cubes = re.findall(r"(\d+) (\w+)", s)
-    for p in cubes:
-        count, color = int(p[0]), p[1]
-        game_round[color] = count
-    return game_round
+class GameTable:
+    # One row per game: its id and the largest count seen for each color
+    def __init__(self) -> None:
+        self.ids = array("I")
+        self.red = array("I")
+        self.green = array("I")
+        self.blue = array("I")
 
+    def add(self, gid: int, red: int, green: int, blue: int) -> None:
+        self.ids.append(gid)
+        self.red.append(red)
+        self.green.append(green)
+        self.blue.append(blue)
 
-def parse_game(s: str) -> Game:
+    def column(self, name: str) -> np.ndarray:
+        # The typecode names the same C type for array and numpy, whatever its size here
+        values = getattr(self, name)
+        return np.frombuffer(values, dtype=np.dtype(values.typecode))
+
+
+def parse_game(s: str) -> tuple[int, int, int, int]:
     head, tail = s.split(":")
     gid = int(re.findall(r"\d+", head)[0])
-    game = Game(gid)
-    for section in tail.split(";"):
-        game.rounds.append(parse_game_round(section))
-    return game
+    most = {"red": 0, "green": 0, "blue": 0}
+    for count, color in re.findall(r"(\d+) (red|green|blue)", tail):
+        most[color] = max(most[color], int(count))
+    return gid, most["red"], most["green"], most["blue"]
 
 
-def is_possible(game: Game, max_cubes: dict[str, int]) -> bool:
-    for game_round in game.rounds:
-        if game_round["red"] > max_cubes["red"]:
-            return False
-        if game_round["green"] > max_cubes["green"]:
-            return False
-        if game_round["blue"] > max_cubes["blue"]:
-            return False
-    return True
+def parse_games(lines: Iterable[str]) -> GameTable:
+    table = GameTable()
+    for line in lines:
+        table.add(*parse_game(line))
+    return table
 
 
-def power_min_cubes(game: Game) -> int:
-    min_red, min_green, min_blue = 0, 0, 0
-    for game_round in game.rounds:
-        min_red = max(min_red, game_round["red"])
-        min_green = max(min_green, game_round["green"])
-        min_blue = max(min_blue, game_round["blue"])
-    return min_red * min_green * min_blue
+def parse_input(s: str) -> GameTable:
+    return parse_games(split_lines(s))
 
 
-def part1(games: list[Game]) -> int:
+def part1(games: GameTable) -> int:
     max_cubes = {
         "red": 12,
         "green": 13,
         "blue": 14
     }
-    return sum(g.id for g in games if is_possible(g, max_cubes))
+    possible = np.ones(len(games.ids), dtype=bool)
+    for color, limit in max_cubes.items():
+        possible &= games.column(color) <= limit
+    return int(games.column("ids")[possible].sum(dtype=np.int64))
 
 
-def part2(games: list[Game]) -> int:
-    return sum(power_min_cubes(g) for g in games)
+def part2(games: GameTable) -> int:
+    power = games.column("red").astype(np.int64) * games.column("green") * games.column("blue")
+    return int(power.sum())
 
 
 def main():
-    lines = get_day_input(2)
-    games = [parse_game(line) for line in lines]
+    s = get_day_input_full_content(2)
+    games = cached_parse(parse_input, s)
     print(part1(games))
     print(part2(games))
 
@@ -1,19 +1,10 @@
 #!/usr/bin/env python3
 
 import regex as re
-from utils import get_day_input
+from utils import cached_parse, get_day_input_full_content, Grid
 from typing import NamedTuple
 from collections import defaultdict
 
-directions = [(-1, -1),
-              (-1, 0),
-              (-1, 1),
-              (0, -1),
-              (0, 1),
-              (1, -1),
-              (1, 0),
-              (1, 1)]
-
 
 class Number(NamedTuple):
     value: int
@@ -22,75 +13,74 @@ class Number(NamedTuple):
     end: int
 
 
-def parse_numbers(schematic: list[str]) -> list[Number]:
+def parse_numbers(schematic: Grid) -> list[Number]:
     numbers = []
-    for i, line in enumerate(schematic):
-        for m in re.finditer(r"\d+", line):
+    for i, line in enumerate(schematic.rows()):
+        for m in re.finditer(rb"\d+", line):
             value = int(m.group())
             start, end = m.span()
             numbers.append(Number(value=value, line=i, start=start, end=end))
     return numbers
 
 
-def is_part_number(number: Number, schematic: list[str]) -> bool:
-    num_lines, num_cols = len(schematic), len(schematic[0])
-    for column in range(number.start, number.end):
-        for d in directions:
-            n_lin = number.line + d[0]
-            n_col = column + d[1]
-            if n_lin < 0 or n_lin >= num_lines or n_col < 0 or n_col >= num_cols:
-                continue
-            c = schematic[n_lin][n_col]
-            if c.isdigit() or c == ".":
-                continue
-            return True
-    return False
-
-
-class Gear(NamedTuple):
+class Symbol(NamedTuple):
+    char: str
     line: int
     column: int
 
 
-def get_adjacent_gears(number: Number, schematic: list[str]) -> set[Gear]:
-    gears: set[Gear] = set()
-    for column in range(number.start, number.end):
-        num_lines, num_cols = len(schematic), len(schematic[0])
-        for d in directions:
-            n_lin = number.line + d[0]
-            n_col = column + d[1]
-            if n_lin < 0 or n_lin >= num_lines or n_col < 0 or n_col >= num_cols:
-                continue
-            c = schematic[n_lin][n_col]
-            if c == "*":
-                gears.add(Gear(line=n_lin, column=n_col))
-    return gears
-
-
-def part1(schematic: list[str]):
-    numbers = parse_numbers(schematic)
-    return sum(number.value for number in numbers if is_part_number(number, schematic))
-
-
-def part2(schematic: list[str]):
-    numbers = parse_numbers(schematic)
-    part_numbers = [number for number in numbers if is_part_number(number, schematic)]
-    gears_map: dict[Gear, list[Number]] = defaultdict(list)
-    for pn in part_numbers:
-        gears = get_adjacent_gears(pn, schematic)
-        for g in gears:
-            gears_map[g].append(pn)
+class SchematicIndex(NamedTuple):
+    part_numbers: list[Number]
+    adjacent: dict[Symbol, list[Number]]
+
+
+def parse_symbols(schematic: Grid) -> dict[tuple[int, int], Symbol]:
+    symbols = {}
+    for i, line in enumerate(schematic.rows()):
+        for m in re.finditer(rb"[^\d.]", line):
+            symbols[(i, m.start())] = Symbol(char=m.group().decode(), line=i, column=m.start())
+    return symbols
+
+
+def index_schematic(schematic: Grid) -> SchematicIndex:
+    # Looks up the cells around each number in a position index of symbols,
+    # so the schematic is scanned once for numbers and once for symbols
+    symbols = parse_symbols(schematic)
+    part_numbers: list[Number] = []
+    adjacent: dict[Symbol, list[Number]] = defaultdict(list)
+    for number in parse_numbers(schematic):
+        border = [(number.line, number.start - 1), (number.line, number.end)]
+        for line in (number.line - 1, number.line + 1):
+            border.extend((line, column) for column in range(number.start - 1, number.end + 1))
+        found = [symbols[pos] for pos in border if pos in symbols]
+        if found:
+            part_numbers.append(number)
+        for symbol in found:
+            adjacent[symbol].append(number)
+    return SchematicIndex(part_numbers=part_numbers, adjacent=adjacent)
+
+
+def parse_input(s: str) -> SchematicIndex:
+    return index_schematic(Grid.parse(s))
+
+
+def part1(index: SchematicIndex):
+    return sum(number.value for number in index.part_numbers)
+
+
+def part2(index: SchematicIndex):
     total_ratio = 0
-    for _, pns in gears_map.items():
-        if len(pns) == 2:
+    for symbol, pns in index.adjacent.items():
+        if symbol.char == "*" and len(pns) == 2:
             total_ratio += pns[0].value * pns[1].value
     return total_ratio
 
 
 def main():
-    schematic = get_day_input(3)
-    print(part1(schematic))
-    print(part2(schematic))
+    s = get_day_input_full_content(3)
+    index = cached_parse(parse_input, s)
+    print(part1(index))
+    print(part2(index))
 
 
 if __name__ == "__main__":
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 
 import regex as re
-from utils import get_day_input
+from utils import cached_parse, get_day_input_full_content, split_lines
+from collections import deque
 from dataclasses import dataclass, field
+from typing import Iterable
+
+import numpy as np
 
 
 @dataclass
@@ -10,6 +14,17 @@ class Card:
     num: int
     win: list[int] = field(default_factory=list)
     actual: list[int] = field(default_factory=list)
+    matches: int = field(init=False)
+
+    def __post_init__(self):
+        self.matches = (to_bitset(self.win) & to_bitset(self.actual)).bit_count()
+
+
+def to_bitset(numbers: list[int]) -> int:
+    bits = 0
+    for n in numbers:
+        bits |= 1 << n
+    return bits
 
 
 def parse_card(s: str) -> Card:
@@ -21,43 +36,52 @@ def parse_card(s: str) -> Card:
     return Card(num=num, win=win, actual=actual)
 
 
+def parse_input(s: str) -> list[Card]:
+    return [parse_card(line) for line in split_lines(s)]
+
+
 def score_card(card: Card) -> int:
-    m = 0
-    for n in card.win:
-        if n in card.actual:
-            m += 1
+    m = card.matches
     return 0 if m == 0 else 2 ** (m - 1)
 
 
 def count_wins(card: Card) -> int:
-    m = 0
-    for n in card.win:
-        if n in card.actual:
-            m += 1
-    return m
+    return card.matches
+
+
+def match_counts(cards: list[Card]) -> np.ndarray:
+    # All cards must have the same number of winning and actual numbers
+    win = np.array([c.win for c in cards])
+    actual = np.array([c.actual for c in cards])
+    return (win[:, :, None] == actual[:, None, :]).any(axis=2).sum(axis=1)
+
+
+def score_cards(cards: list[Card]) -> int:
+    m = match_counts(cards)
+    return int(np.where(m > 0, np.left_shift(1, np.maximum(m - 1, 0)), 0).sum())
 
 
 def part1(cards: list[Card]):
     return sum(score_card(c) for c in cards)
 
 
-def part2(cards: list[Card]):
-    wins = {c.num: count_wins(c) for c in cards}
+def part2(cards: Iterable[Card]):
+    # Cards arrive in order; pending[i] holds the copies won for the i-th next card
+    pending: deque[int] = deque()
     total = 0
-    to_process = [c.num for c in cards]
-    while to_process:
-        new_cards = []
-        for n in to_process:
-            total += 1
-            for i in range(n + 1, n + wins[n] + 1):
-                new_cards.append(i)
-        to_process = new_cards
+    for c in cards:
+        copies = 1 + (pending.popleft() if pending else 0)
+        total += copies
+        wins = count_wins(c)
+        pending.extend([0] * (wins - len(pending)))
+        for i in range(wins):
+            pending[i] += copies
     return total
 
 
 def main():
-    lines = get_day_input(4)
-    cards = [parse_card(l) for l in lines]
+    s = get_day_input_full_content(4)
+    cards = cached_parse(parse_input, s)
     print(part1(cards))
     print(part2(cards))
 
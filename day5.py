@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 import sys
+from bisect import bisect_right
 from dataclasses import dataclass, field
+import numpy as np
 import regex as re
 
-from utils import get_day_input_full_content, chunks
+from utils import cached_parse, get_day_input_full_content, chunks
 
 
 @dataclass
@@ -29,9 +31,9 @@ class CategoryMap:
         first = self.ranges[0]
         last = self.ranges[-1]
         if key >= last.end:
-            return False
+            return key
         if key < first.start:
-            return False
+            return key
         lo, hi = 0, len(self.ranges) - 1
         while lo <= hi:
             mid = (lo + hi) // 2
@@ -44,10 +46,78 @@ class CategoryMap:
                 lo = mid + 1
         return key
 
+    def get_many(self, keys: np.ndarray) -> np.ndarray:
+        starts = np.array([r.start for r in self.ranges], dtype=np.int64)
+        ends = np.array([r.end for r in self.ranges], dtype=np.int64)
+        offsets = np.array([r.base - r.start for r in self.ranges], dtype=np.int64)
+        i = np.searchsorted(starts, keys, side="right") - 1
+        inside = (i >= 0) & (keys < ends[i])
+        return np.where(inside, keys + offsets[i], keys)
+
+    def get_ranges(self, intervals: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        # Map half-open [start, end) intervals, splitting them at range boundaries
+        mapped = []
+        for start, end in intervals:
+            i = bisect_right(self.ranges, start, key=lambda r: r.end)
+            while start < end:
+                if i < len(self.ranges) and self.ranges[i].start <= start:
+                    r = self.ranges[i]
+                    stop = min(end, r.end)
+                    mapped.append((r.get(start), r.get(stop - 1) + 1))
+                    i += 1
+                else:
+                    stop = end if i == len(self.ranges) else min(end, self.ranges[i].start)
+                    mapped.append((start, stop))
+                start = stop
+        return mapped
+
+    def to_piecewise(self) -> "PiecewiseMap":
+        starts, offsets = [], []
+        pos = 0
+        for r in self.ranges:
+            if r.start > pos:
+                starts.append(pos)
+                offsets.append(0)
+            starts.append(r.start)
+            offsets.append(r.base - r.start)
+            pos = r.end
+        starts.append(pos)
+        offsets.append(0)
+        return PiecewiseMap(starts=starts, offsets=offsets)
+
     def __post_init__(self):
         self.ranges.sort(key=lambda r: r.start)
 
 
+@dataclass
+class PiecewiseMap:
+    # Segment i covers [starts[i], starts[i + 1]) and maps key to key + offsets[i]
+    starts: list[int]
+    offsets: list[int]
+
+    def get(self, key: int) -> int:
+        return key + self.offsets[bisect_right(self.starts, key) - 1]
+
+    def get_many(self, keys: np.ndarray) -> np.ndarray:
+        starts = np.array(self.starts, dtype=np.int64)
+        offsets = np.array(self.offsets, dtype=np.int64)
+        return keys + offsets[np.searchsorted(starts, keys, side="right") - 1]
+
+    def then(self, other: "PiecewiseMap") -> "PiecewiseMap":
+        starts, offsets = [], []
+        ends = self.starts[1:] + [sys.maxsize]
+        for start, end, offset in zip(self.starts, ends, self.offsets):
+            i = bisect_right(other.starts, start + offset) - 1
+            while start < end:
+                stop = end if i + 1 == len(other.starts) else min(end, other.starts[i + 1] - offset)
+                if not offsets or offsets[-1] != offset + other.offsets[i]:
+                    starts.append(start)
+                    offsets.append(offset + other.offsets[i])
+                start = stop
+                i += 1
+        return PiecewiseMap(starts=starts, offsets=offsets)
+
+
 class Almanac:
     _path = [
         'seed-to-soil',
@@ -58,15 +128,45 @@ class Almanac:
         'temperature-to-humidity',
         'humidity-to-location']
 
-    def __init__(self, seeds: list[int], maps: dict[str, CategoryMap]) -> None:
+    def __init__(self, seeds: list[int], maps: dict[str, CategoryMap], compose: bool = False) -> None:
         self.seeds = seeds
         self.maps = maps
+        self.composed: PiecewiseMap | None = self.compose() if compose else None
+
+    def compose(self) -> PiecewiseMap:
+        composed = self.maps[self._path[0]].to_piecewise()
+        for name in self._path[1:]:
+            composed = composed.then(self.maps[name].to_piecewise())
+        return composed
 
     def get_location(self, key: int) -> int | None:
+        if self.composed is not None:
+            return self.composed.get(key)
         for name in self._path:
             key = self.maps[name].get(key)
         return key
 
+    def get_locations(self, keys: np.ndarray) -> np.ndarray:
+        keys = np.asarray(keys, dtype=np.int64)
+        if self.composed is not None:
+            return self.composed.get_many(keys)
+        for name in self._path:
+            keys = self.maps[name].get_many(keys)
+        return keys
+
+    def min_location(self, start: int, end: int, chunk_size: int = 1 << 20) -> int:
+        # Walk [start, end) in fixed-size chunks to keep memory bounded
+        lowest = sys.maxsize
+        for chunk_start in range(start, end, chunk_size):
+            seeds = np.arange(chunk_start, min(end, chunk_start + chunk_size), dtype=np.int64)
+            lowest = min(lowest, int(self.get_locations(seeds).min()))
+        return lowest
+
+    def get_location_ranges(self, intervals: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        for name in self._path:
+            intervals = self.maps[name].get_ranges(intervals)
+        return intervals
+
 
 def parse_seeds(s: str) -> list[int]:
     return [int(x.group()) for x in re.finditer(r"\d+", s)]
@@ -84,18 +184,32 @@ def parse_category_map(s: str) -> CategoryMap:
     return CategoryMap(name=name, ranges=ranges)
 
 
-def parse_almanac(s: str) -> Almanac:
+def parse_almanac(s: str, compose: bool = False) -> Almanac:
     sections = s.split("\n\n")
     seeds = parse_seeds(sections[0])
     maps = {c.name: c for c in (parse_category_map(section) for section in sections[1:])}
-    return Almanac(seeds=seeds, maps=maps)
+    return Almanac(seeds=seeds, maps=maps, compose=compose)
+
+
+def parse_input(s: str) -> Almanac:
+    return parse_almanac(s, compose=True)
 
 
 def part1(almanac: Almanac) -> int:
-    return min(almanac.get_location(seed) for seed in almanac.seeds)
+    return int(almanac.get_locations(almanac.seeds).min())
 
 
 def part2(almanac: Almanac) -> int:
+    seed_ranges = [(lst[0], lst[0] + lst[1]) for lst in chunks(almanac.seeds, 2)]
+    return min(start for start, _ in almanac.get_location_ranges(seed_ranges))
+
+
+def part2_vectorized(almanac: Almanac) -> int:
+    seed_ranges = [(lst[0], lst[0] + lst[1]) for lst in chunks(almanac.seeds, 2)]
+    return min(almanac.min_location(start, end) for start, end in seed_ranges)
+
+
+def part2_brute_force(almanac: Almanac) -> int:
     # Brute-force, run with pypy3, takes about 1h to finish
     seed_ranges = [(lst[0], lst[0] + lst[1]) for lst in chunks(almanac.seeds, 2)]
     lowest = sys.maxsize
@@ -107,7 +221,7 @@ def part2(almanac: Almanac) -> int:
 
 def main():
     s = get_day_input_full_content(5)
-    almanac = parse_almanac(s)
+    almanac = cached_parse(parse_input, s)
     print(part1(almanac))
     print(part2(almanac))
 
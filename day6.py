@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 
 
+import sys
+import time
 import regex as re
-from utils import get_day_input_full_content
+from utils import cached_parse, get_day_input_full_content
 from dataclasses import dataclass
+from math import isqrt
 
 
 @dataclass
@@ -20,6 +23,19 @@ def parse_races(s: str) -> list[Race]:
 
 
 def count_ways_to_win(r: Race) -> int:
+    # Winning hold times t satisfy t^2 - T*t + D < 0, i.e. lie strictly between the roots
+    disc = r.time * r.time - 4 * r.distance
+    if disc <= 0:
+        return 0
+    lo = (r.time - isqrt(disc)) // 2
+    while lo > 0 and (lo - 1) * (r.time - lo + 1) > r.distance:
+        lo -= 1
+    while 2 * lo <= r.time and lo * (r.time - lo) <= r.distance:
+        lo += 1
+    return max(0, r.time - 2 * lo + 1)
+
+
+def count_ways_to_win_brute_force(r: Race) -> int:
     ways = 0
     for t in range(0, r.time + 1):
         d = t * (r.time - t)
@@ -28,11 +44,14 @@ def count_ways_to_win(r: Race) -> int:
     return ways
 
 
-def parse_one_race(s: str) -> Race:
-    time, distance = s.split("\n")[0:2]
-    time = int("".join(m.group() for m in re.finditer(r"\d+", time)))
-    distance = int("".join(m.group() for m in re.finditer(r"\d+", distance)))
-    return Race(time=time, distance=distance)
+def merge_races(races: list[Race]) -> Race:
+    # Part 2 reads the sheet as a single race, ignoring the spaces between numbers
+    return Race(time=int("".join(str(r.time) for r in races)),
+                distance=int("".join(str(r.distance) for r in races)))
+
+
+def parse_input(s: str) -> list[Race]:
+    return parse_races(s)
 
 
 def part1(races: list[Race]) -> int:
@@ -42,16 +61,29 @@ def part1(races: list[Race]) -> int:
     return p
 
 
-def part2(race: Race) -> int:
-    return count_ways_to_win(race)
+def part2(races: list[Race]) -> int:
+    return count_ways_to_win(merge_races(races))
+
+
+def benchmark(races: list[Race]):
+    for r in races:
+        start = time.perf_counter()
+        fast = count_ways_to_win(r)
+        fast_time = time.perf_counter() - start
+        start = time.perf_counter()
+        slow = count_ways_to_win_brute_force(r)
+        slow_time = time.perf_counter() - start
+        status = "ok" if fast == slow else "MISMATCH"
+        print(f"{r}: closed-form {fast} in {fast_time:.6f}s, brute-force {slow} in {slow_time:.6f}s [{status}]")
 
 
 def main():
     s = get_day_input_full_content(6)
-    races = parse_races(s)
-    race = parse_one_race(s)
+    races = cached_parse(parse_input, s)
     print(part1(races))
-    print(part2(race))
+    print(part2(races))
+    if "-b" in sys.argv:
+        benchmark(races + [merge_races(races)])
 
 
 if __name__ == "__main__":
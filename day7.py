@@ -4,7 +4,9 @@
 from collections import Counter
 from dataclasses import dataclass
 
-from utils import get_day_input
+import numpy as np
+
+from utils import cached_parse, get_day_input_full_content, split_lines
 
 
 @dataclass
@@ -15,37 +17,44 @@ class Hand:
     best_score: int = 0  # with joker
 
 
+def hand_type(counts: list[int]) -> int:
+    # counts is the card histogram sorted in descending order
+    first = counts[0]
+    second = counts[1] if len(counts) > 1 else 0
+    if first == 5:  # Five of a kind
+        return 6
+    if first == 4:  # Four of a kind
+        return 5
+    if first == 3:
+        return 4 if second == 2 else 3  # Full house or three of a kind
+    if first == 2:
+        return 2 if second == 2 else 1  # Two pairs or one pair
+    return 0  # High card
+
+
+def pack_key(score: int, ranks: tuple[int, ...]) -> int:
+    # Hand type in the high bits, then the five card ranks at 4 bits each
+    key = score
+    for r in ranks:
+        key = (key << 4) | r
+    return key
+
+
 def parse_hand(s: str, card_ranks: str = "23456789TJQKA") -> Hand:
-    ranks = tuple([i for i in (card_ranks.index(c) for c in s)])
-    common = Counter(s).most_common()
-    if len(common) == 1:  # Five of a kind
-        score = 6
-    elif len(common) == 2:
-        if common[0][1] == 4:  # Four of a kind
-            score = 5
-        else:  # Full house
-            score = 4
-    elif len(common) == 3:
-        if common[0][1] == 3:
-            score = 3  # Three of a kind
-        else:
-            score = 2  # Two pairs
-    elif len(common) == 4:  # One pair
-        score = 1
-    else:  # High card
-        score = 0
+    ranks = tuple(card_ranks.index(c) for c in s)
+    score = hand_type(sorted(Counter(s).values(), reverse=True))
     return Hand(cards=s, score=score, ranks=ranks)
 
 
 def parse_hand_with_joker(s: str) -> Hand:
     card_ranks = "J23456789TQKA"
-    hand = parse_hand(s, card_ranks=card_ranks)
-    best_score = hand.score
-    for c in card_ranks[1:]:
-        new_hand = parse_hand(s.replace("J", c), card_ranks=card_ranks)
-        best_score = max(best_score, new_hand.score)
-    hand.best_score = best_score
-    return hand
+    ranks = tuple(card_ranks.index(c) for c in s)
+    counts = Counter(s)
+    score = hand_type(sorted(counts.values(), reverse=True))
+    jokers = counts.pop("J", 0)
+    others = sorted(counts.values(), reverse=True) or [0]
+    others[0] += jokers
+    return Hand(cards=s, score=score, ranks=ranks, best_score=hand_type(others))
 
 
 def parse_hand_and_bid(s: str) -> tuple[Hand, int]:
@@ -53,24 +62,37 @@ def parse_hand_and_bid(s: str) -> tuple[Hand, int]:
     return parse_hand(fst), int(snd)
 
 
+def parse_input(s: str) -> list[str]:
+    return split_lines(s)
+
+
+def total_winnings(keys: list[int], bids: list[int]) -> int:
+    order = np.argsort(np.array(keys, dtype=np.int64), kind="stable")
+    ranked_bids = np.array(bids, dtype=np.int64)[order]
+    return int((ranked_bids * np.arange(1, len(bids) + 1)).sum())
+
+
 def part1(lines: list[str]):
-    hands_and_bids: list[tuple[Hand, int]] = [parse_hand_and_bid(line) for line in lines]
-    hands_and_bids.sort(key=lambda hb: (hb[0].score, hb[0].ranks))
-    return sum(hb[1] * i for i, hb in enumerate(hands_and_bids, start=1))
+    keys, bids = [], []
+    for line in lines:
+        hand, bid = parse_hand_and_bid(line)
+        keys.append(pack_key(hand.score, hand.ranks))
+        bids.append(bid)
+    return total_winnings(keys, bids)
 
 
 def part2(lines: list[str]):
-    hands_and_bids: list[tuple[Hand, int]] = []
+    keys, bids = [], []
     for line in lines:
         fst, snd = line.split(" ")
-        hand, bid = parse_hand_with_joker(fst), int(snd)
-        hands_and_bids.append((hand, bid))
-    hands_and_bids.sort(key=lambda hb: (hb[0].best_score, hb[0].ranks))
-    return sum(hb[1] * i for i, hb in enumerate(hands_and_bids, start=1))
+        hand = parse_hand_with_joker(fst)
+        keys.append(pack_key(hand.best_score, hand.ranks))
+        bids.append(int(snd))
+    return total_winnings(keys, bids)
 
 
 def main():
-    lines = get_day_input(7)
+    lines = cached_parse(parse_input, get_day_input_full_content(7))
     print(part1(lines))
     print(part2(lines))
 
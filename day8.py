@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
-from dataclasses import dataclass
-from math import lcm
+from dataclasses import dataclass, field
+from math import gcd
+from typing import Callable
 
 import regex as re
 
-from utils import get_day_input_full_content
+from utils import cached_parse, get_day_input_full_content
 
 
 @dataclass
@@ -23,39 +24,173 @@ def parse_input(s: str) -> DesertMap:
     return DesertMap(instructions=instructions, network=network)
 
 
+@dataclass
+class CompiledMap:
+    # Nodes are integer ids; moves[i][node] is the node reached by instruction i
+    instructions: str
+    names: list[str]
+    left: list[int]
+    right: list[int]
+    ends: list[bool]
+    moves: list[list[int]] = field(init=False)
+    after_pass: list[int] = field(init=False)
+    end_offsets: list[list[int]] = field(init=False)
+    first_end: list[int] = field(init=False)
+    jumps: list[list[int]] = field(init=False)
+    reaches_end: list[list[bool]] = field(init=False)
+
+    def __post_init__(self):
+        self.moves = [self.left if c == "L" else self.right for c in self.instructions]
+        # end_offsets[n] are the 1-based steps within a pass from n that land on an end node,
+        # first_end[n] the earliest of them or 0 if none
+        self.after_pass, self.end_offsets = [], []
+        for n in range(len(self.names)):
+            node, offsets = n, []
+            for i, move in enumerate(self.moves, start=1):
+                node = move[node]
+                if self.ends[node]:
+                    offsets.append(i)
+            self.after_pass.append(node)
+            self.end_offsets.append(offsets)
+        self.first_end = [offsets[0] if offsets else 0 for offsets in self.end_offsets]
+        # jumps[k][n] is the node after 2^k full passes, reaches_end[k][n] whether an end is hit on the way
+        self.jumps = [self.after_pass]
+        self.reaches_end = [[f > 0 for f in self.first_end]]
+        while len(self.jumps) <= len(self.names).bit_length():
+            self._add_level()
+
+    def _add_level(self):
+        jump, reach = self.jumps[-1], self.reaches_end[-1]
+        self.jumps.append([jump[jump[n]] for n in range(len(jump))])
+        self.reaches_end.append([reach[n] or reach[jump[n]] for n in range(len(jump))])
+
+    def advance(self, node: int, steps: int, offset: int = 0) -> int:
+        # Node reached after `steps` steps starting at instruction index `offset`
+        size = len(self.moves)
+        while steps and offset % size:
+            node = self.moves[offset % size][node]
+            offset += 1
+            steps -= 1
+        passes, rest = divmod(steps, size)
+        k = 0
+        while passes:
+            if k == len(self.jumps):
+                self._add_level()
+            if passes & 1:
+                node = self.jumps[k][node]
+            passes >>= 1
+            k += 1
+        for i in range(rest):
+            node = self.moves[i][node]
+        return node
+
+    def steps_to_end(self, node: int, offset: int = 0) -> int | None:
+        # Steps until the first end node, starting at instruction index `offset`
+        size = len(self.moves)
+        steps = 0
+        while offset % size:
+            node = self.moves[offset % size][node]
+            offset += 1
+            steps += 1
+            if self.ends[node]:
+                return steps
+        passes = 0
+        for k in range(len(self.jumps) - 1, -1, -1):
+            if not self.reaches_end[k][node]:
+                node = self.jumps[k][node]
+                passes += 1 << k
+        if not self.first_end[node]:
+            return None
+        return steps + passes * size + self.first_end[node]
+
+    def analyse_cycle(self, node: int) -> "Cycle":
+        # States at pass boundaries are (node, 0), so the walk repeats once a boundary node does
+        size = len(self.moves)
+        seen: dict[int, int] = {}
+        passes = 0
+        while node not in seen:
+            seen[node] = passes
+            node = self.after_pass[node]
+            passes += 1
+        start, period = seen[node] * size, (passes - seen[node]) * size
+        transient, residues = set(), set()
+        for n, p in seen.items():
+            for steps in (p * size + o for o in self.end_offsets[n]):
+                if steps < start:
+                    transient.add(steps)
+                else:
+                    residues.add(start + (steps - start) % period)
+        return Cycle(start=start, period=period, transient=transient, residues=residues)
+
+
+@dataclass
+class Cycle:
+    # End steps below `start` are held in `transient`; from `start` on they repeat
+    # every `period` steps at the absolute steps held in `residues`
+    start: int
+    period: int
+    transient: set[int]
+    residues: set[int]
+
+    def hits(self, steps: int) -> bool:
+        if steps < self.start:
+            return steps in self.transient
+        return self.start + (steps - self.start) % self.period in self.residues
+
+
+def crt(r1: int, m1: int, r2: int, m2: int) -> tuple[int, int] | None:
+    # Generalized CRT for non-coprime moduli
+    g = gcd(m1, m2)
+    if (r2 - r1) % g:
+        return None
+    m = m1 // g * m2
+    k = (r2 - r1) // g * pow(m1 // g, -1, m2 // g) % (m2 // g)
+    return (r1 + m1 * k) % m, m
+
+
+def first_common_end(cycles: list[Cycle]) -> int | None:
+    if not cycles:
+        return None
+    for steps in sorted(set(t for c in cycles for t in c.transient)):
+        if steps > 0 and all(c.hits(steps) for c in cycles):
+            return steps
+    combined = [(0, 1)]
+    for c in cycles:
+        combined = list({rm for r, m in combined for res in c.residues
+                         if (rm := crt(r, m, res, c.period)) is not None})
+    lower = max(max(c.start for c in cycles), 1)
+    candidates = [r + (lower - r + m - 1) // m * m for r, m in combined]
+    return min(candidates, default=None)
+
+
+def compile_map(dm: DesertMap, is_end: Callable[[str], bool]) -> CompiledMap:
+    names = list(dm.network.keys())
+    ids = {name: i for i, name in enumerate(names)}
+    return CompiledMap(
+        instructions=dm.instructions,
+        names=names,
+        left=[ids[dm.network[name]["L"]] for name in names],
+        right=[ids[dm.network[name]["R"]] for name in names],
+        ends=[is_end(name) for name in names],
+    )
+
+
 def part1(dm: DesertMap, start: str = "AAA", end: str = "ZZZ") -> int:
-    node, i, steps = start, 0, 0
-    while node != end:
-        node = dm.network[node][dm.instructions[i]]
-        i = (i + 1) % len(dm.instructions)
-        steps += 1
-    return steps
+    if start == end:
+        return 0
+    cm = compile_map(dm, lambda name: name == end)
+    return cm.steps_to_end(cm.names.index(start))
 
 
 def part2(dm: DesertMap) -> int:
-    start_nodes = [node for node in dm.network.keys() if node[-1] == "A"]
-    periods = {}
-    for node in start_nodes:
-        periods[node] = find_period(node, dm)
-    return lcm(*(v for v in periods.values()))
-
-
-def find_period(start: str, dm: DesertMap, max_steps: int = 100_000) -> int:
-    node, i, steps = start, 0, 0
-    ends = []
-    while steps < max_steps:
-        node = dm.network[node][dm.instructions[i]]
-        i = (i + 1) % len(dm.instructions)
-        steps += 1
-        if node[-1] == "Z":
-            ends.append(steps)
-        if len(ends) == 2:
-            return ends[1] - ends[0]
+    cm = compile_map(dm, lambda name: name[-1] == "Z")
+    cycles = [cm.analyse_cycle(i) for i, name in enumerate(cm.names) if name[-1] == "A"]
+    return first_common_end(cycles)
 
 
 def main():
     s = get_day_input_full_content(8)
-    dm = parse_input(s)
+    dm = cached_parse(parse_input, s)
     print(part1(dm))
     print(part2(dm))
 
@@ -1,57 +1,87 @@
 #!/usr/bin/env python3
 
+import numpy as np
 import regex as re
-from utils import get_day_input
+from functools import cache
+from utils import cached_parse, get_day_input_full_content, split_lines
 
 
 def parse_history(s: str) -> list[int]:
     return [int(x) for x in re.split(r"\s+", s)]
 
 
-def all_equal(history: list[int]) -> bool:
-    for i in range(1, len(history)):
-        if history[i] != history[i - 1]:
-            return False
-    return True
+@cache
+def extrapolation_coefficients(length: int, position: int) -> tuple[int, ...]:
+    # Lagrange weights of the degree < length polynomial through x = 0..length-1, evaluated
+    # at `position`; for the next value they reduce to signed binomial coefficients
+    coefficients = []
+    for i in range(length):
+        num, den = 1, 1
+        for j in range(length):
+            if j != i:
+                num *= position - j
+                den *= i - j
+        coefficients.append(num // den)
+    return tuple(coefficients)
 
 
-def predict_forward(history: list[int]) -> int:
-    ans = history[-1]
-    while not all_equal(history):
-        new_history = []
-        for i in range(1, len(history)):
-            new_history.append(history[i] - history[i - 1])
-        history = new_history
-        ans += history[-1]
-    return ans
+def extrapolate(history: list[int], position: int) -> int:
+    coefficients = extrapolation_coefficients(len(history), position)
+    return sum(c * x for c, x in zip(coefficients, history))
 
 
-def predict_backward(history: list[int]) -> int:
-    buf = [history[0]]
-    while not all_equal(history):
-        new_history = []
-        for i in range(1, len(history)):
-            new_history.append(history[i] - history[i - 1])
-        history = new_history
-        buf.append(history[0])
-    while len(buf) > 1:
-        right = buf.pop()
-        left = buf.pop()
-        buf.append(left - right)
-    return buf[0]
+def predict_forward(history: list[int], steps: int = 1) -> int:
+    return extrapolate(history, len(history) - 1 + steps)
+
+
+def predict_backward(history: list[int], steps: int = 1) -> int:
+    return extrapolate(history, -steps)
+
+
+def parse_input(s: str) -> list[list[int]]:
+    return [parse_history(line) for line in split_lines(s)]
+
+
+def stack_histories(histories: list[list[int]]) -> np.ndarray | None:
+    # Returns None for ragged input; falls back to object dtype when the differences
+    # or a single prediction could overflow int64
+    if not histories or any(len(h) != len(histories[0]) for h in histories):
+        return None
+    largest = max(abs(x) for h in histories for x in h)
+    if largest << len(histories[0]) >= 1 << 62:
+        return np.array(histories, dtype=object)
+    return np.array(histories, dtype=np.int64)
+
+
+def predict_all(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    forward = np.zeros(matrix.shape[0], dtype=matrix.dtype)
+    backward = np.zeros(matrix.shape[0], dtype=matrix.dtype)
+    sign = 1
+    while matrix.shape[1] and np.any(matrix != 0):
+        forward += matrix[:, -1]
+        backward += sign * matrix[:, 0]
+        sign = -sign
+        matrix = np.diff(matrix, axis=1)
+    return forward, backward
 
 
 def part1(histories: list[list[int]]):
+    matrix = stack_histories(histories)
+    if matrix is not None:
+        return sum(predict_all(matrix)[0].tolist())
     return sum(predict_forward(h) for h in histories)
 
 
 def part2(histories: list[list[int]]):
+    matrix = stack_histories(histories)
+    if matrix is not None:
+        return sum(predict_all(matrix)[1].tolist())
     return sum(predict_backward(h) for h in histories)
 
 
 def main():
-    lines = get_day_input(9)
-    histories = [parse_history(line) for line in lines]
+    s = get_day_input_full_content(9)
+    histories = cached_parse(parse_input, s)
     print(part1(histories))
     print(part2(histories))
 
@@ -3,7 +3,11 @@
 # Template for AoC day solver
 
 import regex as re
-from utils import get_day_input
+from utils import get_day_input_full_content, split_lines
+
+
+def parse_input(s: str):
+    return split_lines(s)
 
 
 def part1(lines: list[str]):
@@ -15,7 +19,7 @@ def part2(lines: list[str]):
 
 
 def main():
-    lines = get_day_input(1)
+    lines = parse_input(get_day_input_full_content(1))
     print(part1(lines))
     print(part2(lines))
 
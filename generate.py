@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+
+# Seeded generators of valid synthetic inputs, one per day, for scaling tests:
+#
+#   python generate.py DAY SIZE [--seed N] > input/dayN_big.txt
+#
+# SIZE is the dimension that grows the workload of each day, e.g. the side of
+# the schematic for day3, the number of seed ranges for day5 or the length of
+# the spring rows for day12.
+
+import argparse
+import string
+from random import Random
+
+from day1 import TR_MAP
+
+
+def generate_day1(size: int, rng: Random) -> str:
+    # size lines of noise, each holding at least one digit
+    lines = []
+    words = list(TR_MAP)
+    for _ in range(size):
+        parts = [str(rng.randrange(10))]
+        for _ in range(rng.randrange(1, 6)):
+            parts.append(rng.choice([rng.choice(words), str(rng.randrange(10)),
+                                     "".join(rng.choices(string.ascii_lowercase, k=rng.randrange(1, 5)))]))
+        rng.shuffle(parts)
+        lines.append("".join(parts))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day2(size: int, rng: Random) -> str:
+    # size games of up to six rounds
+    lines = []
+    for gid in range(1, size + 1):
+        rounds = []
+        for _ in range(rng.randrange(1, 7)):
+            colors = rng.sample(["red", "green", "blue"], rng.randrange(1, 4))
+            rounds.append(", ".join(f"{rng.randrange(1, 21)} {c}" for c in colors))
+        lines.append(f"Game {gid}: " + "; ".join(rounds))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day3(size: int, rng: Random) -> str:
+    # size x size schematic with numbers and symbols scattered over dots
+    rows = []
+    for _ in range(size):
+        row = []
+        while len(row) < size:
+            r = rng.random()
+            if r < 0.15:
+                row.extend(str(rng.randrange(1, 1000)))
+                row.append(".")
+            elif r < 0.22:
+                row.append(rng.choice("*#+$/=%@&-"))
+            else:
+                row.append(".")
+        rows.append("".join(row[:size]))
+    return "\n".join(rows) + "\n"
+
+
+def generate_day4(size: int, rng: Random) -> str:
+    # size cards with 10 winning and 25 actual numbers; no card wins past the last one
+    lines = []
+    for num in range(1, size + 1):
+        pool = rng.sample(range(1, 100), 35)
+        win = pool[:10]
+        matches = min(rng.randrange(0, 11), size - num)
+        actual = rng.sample(win, matches) + pool[10:10 + 25 - matches]
+        rng.shuffle(actual)
+        lines.append(f"Card {num:>4}: " + " ".join(f"{n:>2}" for n in win)
+                     + " | " + " ".join(f"{n:>2}" for n in actual))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day5(size: int, rng: Random) -> str:
+    # size seed ranges of up to a billion seeds, and size ranges in each map
+    limit = 1 << 32
+    seeds = []
+    for _ in range(size):
+        seeds.extend([rng.randrange(limit), rng.randrange(1, 1_000_000_000)])
+    sections = ["seeds: " + " ".join(str(s) for s in seeds)]
+    names = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"]
+    for src, dst in zip(names, names[1:]):
+        starts = sorted(rng.sample(range(limit), size + 1))
+        lines = [f"{src}-to-{dst} map:"]
+        for start, end in zip(starts, starts[1:]):
+            length = rng.randrange(1, end - start + 1)
+            lines.append(f"{rng.randrange(limit)} {start} {length}")
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections) + "\n"
+
+
+def generate_day6(size: int, rng: Random) -> str:
+    # size races, each with at least one winning hold time
+    times, distances = [], []
+    for _ in range(size):
+        t = rng.randrange(10, 100)
+        times.append(t)
+        distances.append(rng.randrange(0, t * t // 4))
+    return ("Time:     " + " ".join(f"{t:>4}" for t in times) + "\n"
+            + "Distance: " + " ".join(f"{d:>4}" for d in distances) + "\n")
+
+
+def generate_day7(size: int, rng: Random) -> str:
+    # size hands with random bids
+    return "".join(f"{''.join(rng.choices('23456789TJQKA', k=5))} {rng.randrange(1, 1001)}\n"
+                   for _ in range(size))
+
+
+def day8_name(taken: set[str], rng: Random, last: str) -> str:
+    # A fresh node name ending in one of the letters of `last`
+    while True:
+        name = "".join(rng.choices(string.ascii_uppercase, k=2)) + rng.choice(last)
+        if name not in taken:
+            taken.add(name)
+            return name
+
+
+def generate_day8(size: int, rng: Random) -> str:
+    # Network of up to size nodes and size // 25 instructions. Each ghost, AAA first,
+    # walks its own chain from its start into a loop of instructions * q nodes closed
+    # by its end node, for distinct small primes q, so both parts have an answer; the
+    # sides the walks never take and the remaining nodes point anywhere
+    size = min(max(size, 2), 24 * 26 * 26)
+    instructions = "".join(rng.choices("LR", k=max(1, size // 25)))
+    n = len(instructions)
+    lengths, used = [], 0
+    for q in rng.sample((2, 3, 5, 7, 11, 13), 6):
+        if used + q * n + 1 <= size:
+            lengths.append(q * n)
+            used += q * n + 1
+    lengths = lengths or [n]
+    taken = {"AAA", "ZZZ"}
+    middle = string.ascii_uppercase[1:-1]
+    ghosts = []
+    for j, length in enumerate(lengths):
+        start = "AAA" if j == 0 else day8_name(taken, rng, "A")
+        end = "ZZZ" if j == 0 else day8_name(taken, rng, "Z")
+        ghosts.append([start] + [day8_name(taken, rng, middle) for _ in range(length - 1)] + [end])
+    while len(taken) < size:
+        day8_name(taken, rng, middle)
+    names = sorted(taken)
+    network = {name: [rng.choice(names), rng.choice(names)] for name in names}
+    for chain in ghosts:
+        # The end node leads back to the first node after the start, at instruction 0 again
+        for i, (node, target) in enumerate(zip(chain, chain[1:] + [chain[1]])):
+            network[node][instructions[i % n] == "R"] = target
+    lines = [f"{name} = ({left}, {right})" for name, (left, right) in network.items()]
+    return instructions + "\n\n" + "\n".join(lines) + "\n"
+
+
+def generate_day9(size: int, rng: Random) -> str:
+    # size histories of 21 values sampled from polynomials of degree up to 5
+    lines = []
+    for _ in range(size):
+        coefficients = [rng.randrange(-10, 11) for _ in range(rng.randrange(1, 7))]
+        values = [sum(c * x ** i for i, c in enumerate(coefficients)) for x in range(21)]
+        lines.append(" ".join(str(v) for v in values))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day10(size: int, rng: Random) -> str:
+    # size x size map whose loop runs along the border, with junk pipes inside
+    size = max(size, 3)
+    rows = ["S" + "-" * (size - 2) + "7"]
+    for _ in range(size - 2):
+        rows.append("|" + "".join(rng.choices("|-LJ7F.", k=size - 2)) + "|")
+    rows.append("L" + "-" * (size - 2) + "J")
+    return "\n".join(rows) + "\n"
+
+
+def generate_day11(size: int, rng: Random) -> str:
+    # size x size image; about a tenth of rows and columns are left empty
+    empty_rows = {r for r in range(size) if rng.random() < 0.1}
+    empty_cols = {c for c in range(size) if rng.random() < 0.1}
+    rows = []
+    for r in range(size):
+        rows.append("".join("#" if r not in empty_rows and c not in empty_cols and rng.random() < 0.05 else "."
+                            for c in range(size)))
+    return "\n".join(rows) + "\n"
+
+
+def generate_day12(size: int, rng: Random) -> str:
+    # 100 records with spring rows of length size, each having at least one arrangement
+    lines = []
+    for _ in range(100):
+        cells = []
+        while len(cells) < size:
+            cells.extend("." * rng.randrange(1, 4))
+            cells.extend("#" * rng.randrange(1, 6))
+        cells = cells[:size]
+        row = "".join(cells)
+        groups = [len(g) for g in row.split(".") if g]
+        if not groups:
+            continue
+        masked = "".join("?" if rng.random() < 0.4 else c for c in row)
+        lines.append(f"{masked} {','.join(str(g) for g in groups)}")
+    return "\n".join(lines) + "\n"
+
+
+def reflection_mismatches(lines: list[str]) -> list[int]:
+    # Mismatching cells for the mirror after each line
+    result = []
+    for i in range(1, len(lines)):
+        pairs = zip(reversed(lines[:i]), lines[i:])
+        result.append(sum(a != b for x, y in pairs for a, b in zip(x, y)))
+    return result
+
+
+def generate_day13_pattern(rng: Random) -> str:
+    # Perfect vertical mirror for part1, plus a horizontal mirror broken by one
+    # cell in a column the vertical mirror does not cover, for part2
+    while True:
+        width, height = rng.randrange(5, 18), rng.randrange(5, 18)
+        a, b = rng.randrange(1, (width + 1) // 2), rng.randrange(1, height)
+        rows = []
+        for _ in range(height):
+            half = "".join(rng.choices("#.", k=a))
+            rows.append(half + half[::-1] + "".join(rng.choices("#.", k=width - 2 * a)))
+        reach = min(b, height - b)
+        for k in range(reach):
+            rows[b + k] = rows[b - 1 - k]
+        row, col = rng.randrange(b - reach, b + reach), rng.randrange(2 * a, width)
+        rows[row] = rows[row][:col] + ("." if rows[row][col] == "#" else "#") + rows[row][col + 1:]
+        col_counts = reflection_mismatches(["".join(c) for c in zip(*rows)])
+        row_counts = reflection_mismatches(rows)
+        if col_counts.count(0) + row_counts.count(0) == 1 and col_counts.count(1) + row_counts.count(1) == 1 \
+                and col_counts[a - 1] == 0 and row_counts[b - 1] == 1:
+            return "\n".join(rows)
+
+
+def generate_day13(size: int, rng: Random) -> str:
+    # size patterns
+    return "\n\n".join(generate_day13_pattern(rng) for _ in range(size)) + "\n"
+
+
+GENERATORS = {
+    1: generate_day1,
+    2: generate_day2,
+    3: generate_day3,
+    4: generate_day4,
+    5: generate_day5,
+    6: generate_day6,
+    7: generate_day7,
+    8: generate_day8,
+    9: generate_day9,
+    10: generate_day10,
+    11: generate_day11,
+    12: generate_day12,
+    13: generate_day13,
+}
+
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    return GENERATORS[day](size, Random(seed))
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="generate")
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS))
+    parser.add_argument("size", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(generate(args.day, args.size, args.seed), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,13 @@
+import hashlib
+import inspect
+import mmap
+import os
+import pickle
 import sys
 import regex as re
+from contextlib import contextmanager
+from functools import cache
+from typing import Iterator
 
 
 def get_day_input(day: int) -> list[str]:
@@ -12,8 +20,14 @@ def _get_input_filename(day: int) -> str:
     suffix = ""
     if is_test:
         suffix = "_test"
-        if len(sys.argv) == 3:
-            suffix += sys.argv[2]
+        # the argument after -t, unless it is another flag such as day6's -b
+        i = sys.argv.index("-t") + 1
+        if i < len(sys.argv) and not sys.argv[i].startswith("-"):
+            suffix += sys.argv[i]
+    return get_input_filename(day, suffix)
+
+
+def get_input_filename(day: int, suffix: str = "") -> str:
     return f"input/day{day}{suffix}.txt"
 
 
@@ -22,6 +36,102 @@ def get_day_input_full_content(day: int) -> str:
         return infile.read()
 
 
+@contextmanager
+def get_day_input_buffer(day: int) -> Iterator[memoryview]:
+    # Read-only view of the memory-mapped input; parsers can scan it in place with
+    # bytes patterns. Views taken from it must not outlive the with block.
+    with open(_get_input_filename(day), "rb") as infile:
+        if os.fstat(infile.fileno()).st_size == 0:
+            yield memoryview(b"")
+            return
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                yield view
+
+
+def iter_day_input_lines(day: int) -> Iterator[memoryview]:
+    # Lazily yields each line of the memory-mapped input without the line ending and
+    # without copying; use bytes(line) to keep a line past the next iteration
+    with open(_get_input_filename(day), "rb") as infile:
+        if os.fstat(infile.fileno()).st_size == 0:
+            return
+        mm = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mm)
+    start = 0
+    while start < len(mm):
+        end = mm.find(b"\n", start)
+        if end == -1:
+            end = len(mm)
+        stop = end - 1 if end > start and mm[end - 1] == ord("\r") else end
+        yield view[start:stop]
+        start = end + 1
+    try:
+        view.release()
+        mm.close()
+    except BufferError:
+        # lines still referenced by the caller; the mapping goes away with them
+        pass
+
+
+PARSE_CACHE_ENV = "AOC_PARSE_CACHE"
+PARSE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+def cached_parse(parse, s: str, cache_dir: str | None = None, max_bytes: int = PARSE_CACHE_MAX_BYTES):
+    # Opt-in: only active when a cache directory is given or set in $AOC_PARSE_CACHE.
+    # Entries are keyed by the input and the source of the parser's module and of this
+    # one, since the pickles hold classes like Grid, and the least recently used ones
+    # are evicted once the directory grows past max_bytes.
+    cache_dir = cache_dir or os.environ.get(PARSE_CACHE_ENV)
+    if not cache_dir:
+        return parse(s)
+    try:
+        sources = [inspect.getsource(sys.modules[name]) for name in (parse.__module__, __name__)]
+    except (OSError, TypeError):
+        # no source to key on, e.g. a parser defined interactively
+        return parse(s)
+    key = hashlib.sha256()
+    key.update(parse.__module__.encode())
+    for source in sources:
+        key.update(source.encode())
+    key.update(s.encode())
+    path = os.path.join(cache_dir, f"{key.hexdigest()}.pickle")
+    try:
+        with open(path, "rb") as infile:
+            parsed = pickle.load(infile)
+        os.utime(path)
+        return parsed
+    except Exception:
+        # unreadable or stale entries, e.g. pickling a class that has since moved, are misses
+        pass
+    parsed = parse(s)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as outfile:
+        pickle.dump(parsed, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    _evict_parse_cache(cache_dir, max_bytes)
+    return parsed
+
+
+def _evict_parse_cache(cache_dir: str, max_bytes: int):
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(".pickle"):
+            st = os.stat(os.path.join(cache_dir, name))
+            entries.append((st.st_mtime, st.st_size, name))
+    total = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(os.path.join(cache_dir, name))
+        total -= size
+
+
+def split_lines(s: str) -> list[str]:
+    return [line.strip() for line in s.splitlines()]
+
+
 def chunks(lst, size: int):
     for i in range(0, len(lst), size):
         yield lst[i:i + size]
@@ -29,3 +139,83 @@ def chunks(lst, size: int):
 
 def parse_ints(s: str) -> list[int]:
     return [int(m.group()) for m in re.finditer(r"\d+", s)]
+
+
+@cache
+def _mask_table(ch: str) -> bytes:
+    # bytes.translate table mapping ch to "1" and every other byte to "0"
+    return bytes(48 + (b == ord(ch)) for b in range(256))
+
+
+class Grid:
+    # Cells live in one contiguous bytearray in row-major order. A transposed grid
+    # shares the buffer and swaps the strides, so transpose() is O(1).
+    ORTHOGONAL = ((-1, 0), (1, 0), (0, -1), (0, 1))
+    ALL = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+    def __init__(self, cells: bytearray, height: int, width: int, transposed: bool = False) -> None:
+        # height and width describe the buffer layout; a transposed view swaps them
+        self.cells = cells
+        self.transposed = transposed
+        if transposed:
+            self.height, self.width = width, height
+            self.row_stride, self.col_stride = 1, width
+        else:
+            self.height, self.width = height, width
+            self.row_stride, self.col_stride = width, 1
+        # flat index delta for each neighbour offset
+        self.offsets = {d: d[0] * self.row_stride + d[1] * self.col_stride for d in self.ALL}
+
+    @classmethod
+    def parse(cls, s: str) -> "Grid":
+        lines = [line for line in s.split("\n") if line]
+        return cls(bytearray("".join(lines), "ascii"), len(lines), len(lines[0]))
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.row_stride + col * self.col_stride
+
+    def position(self, index: int) -> tuple[int, int]:
+        fst, snd = divmod(index, self.col_stride if self.transposed else self.row_stride)
+        return (snd, fst) if self.transposed else (fst, snd)
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row < self.height and 0 <= col < self.width
+
+    def get(self, row: int, col: int) -> str:
+        return chr(self.cells[self.index(row, col)])
+
+    def set(self, row: int, col: int, ch: str) -> None:
+        self.cells[self.index(row, col)] = ord(ch)
+
+    def transpose(self) -> "Grid":
+        if self.transposed:
+            return Grid(self.cells, self.width, self.height)
+        return Grid(self.cells, self.height, self.width, transposed=True)
+
+    def neighbours(self, row: int, col: int, diagonal: bool = False):
+        for dr, dc in self.ALL if diagonal else self.ORTHOGONAL:
+            if 0 <= row + dr < self.height and 0 <= col + dc < self.width:
+                yield row + dr, col + dc
+
+    def row(self, row: int) -> bytes:
+        if self.transposed:
+            return bytes(self.cells[row::self.col_stride])
+        return bytes(self.cells[row * self.width:(row + 1) * self.width])
+
+    def rows(self):
+        for row in range(self.height):
+            yield self.row(row)
+
+    def row_masks(self, ch: str = "#") -> list[int]:
+        # One integer per row with a bit set where the cell is ch, first column most significant
+        bits = self.cells.translate(_mask_table(ch))
+        if self.transposed:
+            return [int(bits[row::self.col_stride], 2) for row in range(self.height)]
+        return [int(bits[start:start + self.width], 2) for start in range(0, len(bits), self.width)]
+
+    def col_masks(self, ch: str = "#") -> list[int]:
+        return self.transpose().row_masks(ch)
+
+    def find_all(self, ch: str) -> list[tuple[int, int]]:
+        target = ord(ch)
+        return [(row, col) for row in range(self.height) for col, b in enumerate(self.row(row)) if b == target]